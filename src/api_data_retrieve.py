@@ -6,9 +6,17 @@ Fetches genres, movies, images, and credits information using a Bearer token
 loaded from environment variables.
 """
 
+import functools
 import os
+import threading
+import time
+
+import orjson
 import requests
+import requests_cache
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables from .env
 load_dotenv(verbose=True, override=True)
@@ -22,11 +30,130 @@ if not TMDB_BEARER_TOKEN:
     raise EnvironmentError(
         "TMDB_BEARER_TOKEN is not set in the environment variables.")
 
-# Define common headers for the API requests
-HEADERS = {
-    "Authorization": f"Bearer {TMDB_BEARER_TOKEN}",
-    "Content-Type": "application/json;charset=utf-8"
-}
+# (connect, read) timeouts in seconds for every TMDb request
+TIMEOUT = (3, 10)
+
+# Requests per second allowed towards TMDb, kept slightly under its limit
+TMDB_REQUESTS_PER_SECOND = float(os.environ.get("TMDB_REQUESTS_PER_SECOND", 9))
+
+# How long cached TMDb responses are served without contacting TMDb; a day
+# by default, so a re-run of an interrupted seed is served from disk
+TMDB_CACHE_EXPIRE_SECONDS = int(os.environ.get("TMDB_CACHE_EXPIRE_SECONDS",
+                                               86400))
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing `rate` requests per `per` seconds.
+
+    Tokens refill continuously, so requests go out as soon as budget is
+    available instead of waiting for a fixed window to end; at most `rate`
+    requests can burst at once.
+
+    The rate adapts AIMD-style: throttle() halves it when the server
+    answers 429, and every successful request adds back 1/rate, i.e. about
+    one request per second of clean traffic, up to the configured rate.
+    """
+
+    def __init__(self, rate, per=1.0, min_rate=1.0):
+        self.rate = rate
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.per = per
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Block until a request may be sent, then consume one token.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.rate,
+                    self._tokens + (now - self._updated) * self.rate / self.per
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.per / self.rate
+            time.sleep(wait)
+
+    def throttle(self):
+        """
+        Multiplicative decrease: halve the rate after a 429 response.
+        """
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self._tokens = min(self._tokens, self.rate)
+
+    def recover(self):
+        """
+        Additive increase: raise the rate after a successful response.
+        """
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that takes a RateLimiter token before each request goes out
+    on the network. Responses served from the cache never reach the adapter,
+    so they do not consume any of the budget.
+
+    429 responses, including ones already retried by urllib3 (which waits
+    for Retry-After), throttle the limiter; other responses let it recover.
+    """
+
+    def __init__(self, limiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        response = super().send(request, **kwargs)
+
+        retries = getattr(response.raw, "retries", None)
+        history = retries.history if retries is not None else ()
+        if response.status_code == 429 or any(h.status == 429 for h in history):
+            self.limiter.throttle()
+        else:
+            self.limiter.recover()
+        return response
+
+
+RATE_LIMITER = RateLimiter(TMDB_REQUESTS_PER_SECOND)
+
+# Shared session: keeps TLS connections to api.themoviedb.org alive between
+# calls and retries transient failures (rate limiting, 5xx) with exponential
+# backoff capped at 30 s, honoring Retry-After when the server sends it.
+# Responses are cached on disk (tmdb_cache.sqlite) for
+# TMDB_CACHE_EXPIRE_SECONDS; TMDb's own Cache-Control max-age is ignored so
+# that setting always applies. Once an entry expires it is revalidated with
+# If-None-Match / If-Modified-Since, so unchanged data comes back as a
+# body-less 304.
+SESSION = requests_cache.CachedSession(
+    "tmdb_cache",
+    backend="sqlite",
+    cache_control=False,
+    expire_after=TMDB_CACHE_EXPIRE_SECONDS,
+    stale_if_error=True
+)
+# Headers are set on the session once and merged into every request.
+# The GETs carry no body, so only Accept is sent, not Content-Type.
+SESSION.headers["Authorization"] = f"Bearer {TMDB_BEARER_TOKEN}"
+SESSION.headers["Accept"] = "application/json"
+SESSION.mount("https://", RateLimitedAdapter(
+    RATE_LIMITER,
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=5, backoff_factor=1, backoff_max=30,
+                      status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+))
 
 
 def get_all_genres():
@@ -40,9 +167,9 @@ def get_all_genres():
     :raises HTTPError: If the request status code is 4xx or 5xx.
     """
     url = f"{BASE_URL}/genre/movie/list"
-    response = requests.get(url, headers=HEADERS)
+    response = SESSION.get(url, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
 def get_movies_by_genre(genre_id):
@@ -58,9 +185,9 @@ def get_movies_by_genre(genre_id):
     """
     url = f"{BASE_URL}/discover/movie"
     params = {"with_genres": str(genre_id)}
-    response = requests.get(url, headers=HEADERS, params=params)
+    response = SESSION.get(url, params=params, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
 def get_movies_by_page(page):
@@ -76,11 +203,12 @@ def get_movies_by_page(page):
     """
     url = f"{BASE_URL}/movie/popular"
     params = {"page": str(page)}
-    response = requests.get(url, headers=HEADERS, params=params)
+    response = SESSION.get(url, params=params, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
+@functools.lru_cache(maxsize=4096)
 def get_movie_by_id(movie_id):
     """
     Fetch movie details by its ID.
@@ -88,16 +216,18 @@ def get_movie_by_id(movie_id):
     Endpoint: GET /movie/<movie_id>
 
     :param movie_id: The movie's ID (int or str).
-    :return: A JSON object containing the movie details.
+    :return: A JSON object containing the movie details. Results are cached
+        per process; treat the returned dict as read-only.
     :rtype: dict
     :raises HTTPError: If the request status code is 4xx or 5xx.
     """
     url = f"{BASE_URL}/movie/{movie_id}"
-    response = requests.get(url, headers=HEADERS)
+    response = SESSION.get(url, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
+@functools.lru_cache(maxsize=4096)
 def get_movie_images(movie_id):
     """
     Fetch all images for a specific movie.
@@ -105,16 +235,18 @@ def get_movie_images(movie_id):
     Endpoint: GET /movie/<movie_id>/images
 
     :param movie_id: The movie's ID (int or str).
-    :return: A JSON object containing image details.
+    :return: A JSON object containing image details. Results are cached
+        per process; treat the returned dict as read-only.
     :rtype: dict
     :raises HTTPError: If the request status code is 4xx or 5xx.
     """
     url = f"{BASE_URL}/movie/{movie_id}/images"
-    response = requests.get(url, headers=HEADERS)
+    response = SESSION.get(url, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
+@functools.lru_cache(maxsize=4096)
 def get_movie_credits(movie_id):
     """
     Fetch cast and crew information for a specific movie.
@@ -122,14 +254,15 @@ def get_movie_credits(movie_id):
     Endpoint: GET /movie/<movie_id>/credits
 
     :param movie_id: The movie's ID (int or str).
-    :return: A JSON object containing cast and crew details.
+    :return: A JSON object containing cast and crew details. Results are
+        cached per process; treat the returned dict as read-only.
     :rtype: dict
     :raises HTTPError: If the request status code is 4xx or 5xx.
     """
     url = f"{BASE_URL}/movie/{movie_id}/credits"
-    response = requests.get(url, headers=HEADERS)
+    response = SESSION.get(url, timeout=TIMEOUT)
     response.raise_for_status()
-    return response.json()
+    return orjson.loads(response.content)
 
 
 # Quick Testing
@@ -1,4 +1,5 @@
 import dotenv
+import logging
 import os
 import mysql.connector
 from mysql.connector import Error
@@ -7,20 +8,212 @@ from dotenv import load_dotenv
 # Load environment variables from the .env file
 load_dotenv(verbose=True, override=True)
 
+logger = logging.getLogger(__name__)
+
+# Schema DDL, built once at import and joined into a single script so
+# create_db() can send it in one round trip.
+_DDL_MOVIES = """
+    CREATE TABLE IF NOT EXISTS movies (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        movieId INT NOT NULL UNIQUE,  -- TMDb id, referenced by child tables
+        adult BOOLEAN,
+        backdrop_path VARCHAR(64),  -- / + 27 chars + extension
+        original_language CHAR(2),  -- ISO 639-1
+        original_title VARCHAR(255),
+        overview TEXT,
+        popularity DECIMAL(8,3),
+        poster_path VARCHAR(64),
+        release_date DATE,
+        title VARCHAR(255),
+        video BOOLEAN,
+        vote_average DECIMAL(3,1),
+        vote_count INT,
+        -- covers ORDER BY popularity DESC LIMIT n reads, no sort or lookups
+        INDEX idx_pop_cov (popularity DESC, id, title, vote_count),
+        -- MATCH(title) AGAINST search in queries_execution.py
+        FULLTEXT KEY ft_title (title)
+    ) ENGINE=InnoDB
+"""
+
+_DDL_GENRES = """
+    CREATE TABLE IF NOT EXISTS genres (
+        id INT PRIMARY KEY,
+        name VARCHAR(50)
+    ) ENGINE=InnoDB
+"""
+
+_DDL_MOVIE_GENRES = """
+    CREATE TABLE IF NOT EXISTS movie_genres (
+        movie_id INT,
+        genre_id INT,
+        PRIMARY KEY (movie_id, genre_id),
+        FOREIGN KEY (movie_id) REFERENCES movies(movieId) ON DELETE CASCADE,
+        FOREIGN KEY (genre_id) REFERENCES genres(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+"""
+
+_DDL_IMAGES = """
+    CREATE TABLE IF NOT EXISTS images (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        movie_id INT,
+        type ENUM('backdrop', 'logo', 'poster') NOT NULL,
+        file_path VARCHAR(64),
+        aspect_ratio DECIMAL(5,3),
+        height INT,
+        width INT,
+        vote_average DECIMAL(3,1),
+        vote_count INT,
+        iso_639_1 CHAR(2),
+        UNIQUE KEY ux_images_file (movie_id, type, file_path),
+        FOREIGN KEY (movie_id) REFERENCES movies(movieId) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+"""
+
+_DDL_PERSONS = """
+    CREATE TABLE IF NOT EXISTS persons (
+        id INT PRIMARY KEY, 
+        name VARCHAR(255),
+        original_name VARCHAR(255),
+        gender INT,
+        popularity DECIMAL(8,3),
+        profile_path VARCHAR(64),
+        known_for_department VARCHAR(32)  -- short fixed TMDb list
+    ) ENGINE=InnoDB
+"""
+
+_DDL_MOVIE_CREDITS = """
+    CREATE TABLE IF NOT EXISTS movie_credits (
+        credit_id VARCHAR(32) PRIMARY KEY,  -- 24 hex chars
+        movie_id INT,
+        person_id INT,
+        type ENUM('cast', 'crew') NOT NULL,
+        cast_order INT,
+        character_name VARCHAR(255),
+        department VARCHAR(32),
+        job VARCHAR(100),
+        -- cast of one movie, read from the index alone
+        INDEX idx_movie_type_person (movie_id, type, person_id),
+        -- covers the role/gender grouping over all credits
+        INDEX idx_type_job_person (type, job, person_id),
+        FOREIGN KEY (movie_id) REFERENCES movies(movieId) ON DELETE CASCADE,
+        FOREIGN KEY (person_id) REFERENCES persons(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+"""
+
+# Per-movie progress of the cast/crew and image seeders, so an interrupted
+# seeding run can resume instead of starting over
+_DDL_SEEDED_MOVIES = """
+    CREATE TABLE IF NOT EXISTS seeded_movies (
+        movie_id INT,
+        stage ENUM('credits', 'images') NOT NULL,
+        PRIMARY KEY (movie_id, stage),
+        FOREIGN KEY (movie_id) REFERENCES movies(movieId) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+"""
+
+# Precomputed per-genre summary read by Query #2 in queries_execution.py.
+# MySQL has no materialized views, so this is a plain table that seeding
+# refreshes once the data has changed (see queries_db_script.py).
+_DDL_MV_GENRE_TOP_MOVIE = """
+    CREATE TABLE IF NOT EXISTS mv_genre_top_movie (
+        genre_id INT PRIMARY KEY,
+        genre_name VARCHAR(50),
+        movie_count INT NOT NULL,
+        most_popular_movie VARCHAR(255),
+        FOREIGN KEY (genre_id) REFERENCES genres(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB
+"""
+
+_DDL_SCRIPT = ";\n".join((
+    _DDL_MOVIES,
+    _DDL_GENRES,
+    _DDL_MOVIE_GENRES,
+    _DDL_IMAGES,
+    _DDL_PERSONS,
+    _DDL_MOVIE_CREDITS,
+    _DDL_SEEDED_MOVIES,
+    _DDL_MV_GENRE_TOP_MOVIE,
+))
+
+
+# Indexes added to tables that already existed in released schemas.
+# CREATE TABLE IF NOT EXISTS does not touch an existing table, so create_db()
+# adds whichever of these the database lacks: (table, index, ALTER clause).
+_INDEX_MIGRATIONS = (
+    ("movies", "idx_pop_cov",
+     "ADD INDEX idx_pop_cov (popularity DESC, id, title, vote_count)"),
+    ("images", "ux_images_file",
+     "ADD UNIQUE KEY ux_images_file (movie_id, type, file_path)"),
+    ("movies", "ft_title", "ADD FULLTEXT KEY ft_title (title)"),
+    ("movie_credits", "idx_movie_type_person",
+     "ADD INDEX idx_movie_type_person (movie_id, type, person_id)"),
+    ("movie_credits", "idx_type_job_person",
+     "ADD INDEX idx_type_job_person (type, job, person_id)"),
+)
+
+# Indexes of older schemas that a newer index replaces: (table, index)
+_OBSOLETE_INDEXES = (
+    ("movies", "idx_popularity"),  # superseded by idx_pop_cov
+)
+
+
+def _add_missing_indexes(cursor):
+    """
+    Adds every index in _INDEX_MIGRATIONS that the current database does
+    not have yet and drops the _OBSOLETE_INDEXES it still has; running it
+    again is a no-op.
+    """
+    cursor.execute("""
+        SELECT DISTINCT TABLE_NAME, INDEX_NAME
+        FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE()
+    """)
+    existing = set(cursor.fetchall())
+    for table, index_name, clause in _INDEX_MIGRATIONS:
+        if (table, index_name) not in existing:
+            logger.info("Adding index %s to '%s'...", index_name, table)
+            cursor.execute(f"ALTER TABLE {table} {clause}")
+    for table, index_name in _OBSOLETE_INDEXES:
+        if (table, index_name) in existing:
+            logger.info("Dropping index %s from '%s'...", index_name, table)
+            cursor.execute(f"ALTER TABLE {table} DROP INDEX {index_name}")
+
+
+# Child tables whose foreign key to 'movies' still targets movies.id. They
+# come from databases created before the tables were keyed on the TMDb
+# movieId; CREATE TABLE IF NOT EXISTS leaves them as they are, so such a
+# database has to be dropped and re-created.
+STALE_MOVIE_REFS_QUERY = """
+    SELECT DISTINCT TABLE_NAME
+    FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND REFERENCED_TABLE_NAME = 'movies'
+      AND REFERENCED_COLUMN_NAME <> 'movieId'
+"""
+
+
+def find_stale_movie_refs(cursor):
+    """
+    Returns the sorted names of the tables in the current database whose
+    foreign key to 'movies' does not reference movies.movieId.
+    """
+    cursor.execute(STALE_MOVIE_REFS_QUERY)
+    return sorted(row[0] for row in cursor.fetchall())
+
 
 def create_db():
     """
     Connects to MySQL, creates (if needed) a database, and then creates the required tables.
     """
 
-    print("Creating the database and tables...")
+    logger.info("Creating the database and tables...")
 
     db_host = os.getenv('MYSQL_HOST')
     db_user = os.getenv('MYSQL_USER')
     db_password = os.getenv('MYSQL_PASSWORD')
     db_name = os.getenv('MYSQL_DATABASE')
 
-    print(f"Creating database {db_name}...")
+    logger.info("Creating database %s...", db_name)
 
     conn = None
     cursor = None
@@ -32,132 +225,52 @@ def create_db():
             password=db_password
         )
         if conn.is_connected():
-            print("Successfully connected to the MySQL server.")
+            logger.debug("Successfully connected to the MySQL server.")
 
-        # 2) Create the database if it does not exist
+        # 2) Create the database if it does not exist; probing first is a
+        #    plain read, so an existing database skips the DDL entirely
         cursor = conn.cursor()
-        cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name};")
-        print(f"Database '{db_name}' is ready (created or already exists).")
-
-        # 3) Use the newly created or existing database
-        cursor.execute(f"USE {db_name};")
-
-        # 4) Create tables inside the chosen database
-        print("Creating 'movies' table...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS movies (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                movieId INT UNIQUE,
-                adult BOOLEAN,
-                backdrop_path VARCHAR(255),
-                original_language VARCHAR(10),
-                original_title VARCHAR(255),
-                overview TEXT,
-                popularity DECIMAL(8,3),
-                poster_path VARCHAR(255),
-                release_date DATE,
-                title VARCHAR(255),
-                video BOOLEAN,
-                vote_average DECIMAL(3,1),
-                vote_count INT
-            ) ENGINE=InnoDB;
-        """)
-        print("'movies' table created or already exists.")
-
-        print("Creating 'genres' table...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS genres (
-                id INT PRIMARY KEY,
-                name VARCHAR(50)
-            ) ENGINE=InnoDB;
-        """)
-        print("'genres' table created or already exists.")
-
-        print("Creating 'movie_genres' table (join table)...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS movie_genres (
-                movie_id INT,
-                genre_id INT,
-                PRIMARY KEY (movie_id, genre_id),
-                FOREIGN KEY (movie_id) REFERENCES movies(id) ON DELETE CASCADE,
-                FOREIGN KEY (genre_id) REFERENCES genres(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB;
-        """)
-        print("'movie_genres' table created or already exists.")
-
-        print("Creating 'images' table...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS images (
-                id INT AUTO_INCREMENT PRIMARY KEY,
-                movie_id INT,
-                type ENUM('backdrop', 'logo', 'poster') NOT NULL,
-                file_path VARCHAR(255),
-                aspect_ratio DECIMAL(5,3),
-                height INT,
-                width INT,
-                vote_average DECIMAL(3,1),
-                vote_count INT,
-                iso_639_1 VARCHAR(10),
-                FOREIGN KEY (movie_id) REFERENCES movies(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB;
-        """)
-        print("'images' table created or already exists.")
-
-        print("Creating 'persons' table...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS persons (
-                id INT PRIMARY KEY, 
-                name VARCHAR(255),
-                original_name VARCHAR(255),
-                gender INT,
-                popularity DECIMAL(8,3),
-                profile_path VARCHAR(255),
-                known_for_department VARCHAR(100)
-            ) ENGINE=InnoDB;
-        """)
-        print("'persons' table created or already exists.")
-
-        print("Creating 'movie_credits' table...")
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS movie_credits (
-                credit_id VARCHAR(50) PRIMARY KEY,
-                movie_id INT,
-                person_id INT,
-                type ENUM('cast', 'crew') NOT NULL,
-                cast_order INT,
-                character_name VARCHAR(255),
-                department VARCHAR(100),
-                job VARCHAR(100),
-                FOREIGN KEY (movie_id) REFERENCES movies(id) ON DELETE CASCADE,
-                FOREIGN KEY (person_id) REFERENCES persons(id) ON DELETE CASCADE
-            ) ENGINE=InnoDB;
-        """)
-        print("'movie_credits' table created or already exists.")
-
-        # Example of creating an index (optional):
-        try:
-            cursor.execute(
-                "CREATE INDEX idx_popularity ON movies (popularity);")
-        except mysql.connector.Error as e:
-            if e.errno == 1061:  # 1061 = "duplicate key name" in MySQL
-                print("Index already exists, skipping.")
-            else:
-                raise
+        db_pattern = db_name.replace("%", r"\%").replace("_", r"\_")
+        cursor.execute("SHOW DATABASES LIKE %s", (db_pattern,))
+        if cursor.fetchone() is None:
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name};")
+            logger.info("Database '%s' created.", db_name)
+        else:
+            logger.info("Database '%s' already exists.", db_name)
+
+        # 3) Switch to the database and create all tables (indexes
+        #    included) in a single multi-statement round trip
+        cursor.execute(f"USE {db_name};\n{_DDL_SCRIPT}")
+        while cursor.nextset():
+            pass
+        logger.debug("All tables created or already exist.")
+
+        # 4) Stop on a database created with the old movie references
+        stale = find_stale_movie_refs(cursor)
+        if stale:
+            logger.error("Tables %s reference movies.id from an older schema; "
+                         "drop database '%s' and run this script again.",
+                         ", ".join(stale), db_name)
+            return
+
+        # 5) Bring the indexes of tables from an older schema up to date
+        _add_missing_indexes(cursor)
 
         conn.commit()  # Commit DDL changes
-        print("All tables have been created successfully.")
+        logger.info("All tables have been created successfully.")
 
     except Error as e:
-        print(f"Database error: {e}")
+        logger.error("Database error: %s", e)
     except Exception as ex:
-        print(f"General error: {ex}")
+        logger.error("General error: %s", ex)
     finally:
         if cursor is not None:
             cursor.close()
         if conn is not None and conn.is_connected():
             conn.close()
-            print("MySQL connection is closed.")
+            logger.debug("MySQL connection is closed.")
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     create_db()
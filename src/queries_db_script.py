@@ -1,8 +1,14 @@
+import logging
 import os
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from itertools import islice
+from operator import itemgetter
 from dotenv import load_dotenv
-import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+
+from create_db_script import find_stale_movie_refs
 
 # Import your API data methods (adjust name to your actual file/module)
 from api_data_retrieve import (
@@ -18,26 +24,439 @@ from api_data_retrieve import (
 # For this example, we'll define a simple connector inline.
 load_dotenv(verbose=True, override=True)
 
+# Progress goes through logging: per-movie lines are DEBUG, so a normal run
+# (LOG_LEVEL=INFO) writes a line per page or stage instead of per movie.
+logger = logging.getLogger(__name__)
+
+# Shared connection pool, created on first use so that importing this module
+# does not require the database to exist yet (see create_db_script.py).
+_POOL = None
+
+# Seeding commits once per this many TMDb pages instead of once per page
+COMMIT_EVERY_PAGES = 10
+
+# Per-movie seeding accumulates rows across movies and flushes them (one
+# executemany per table plus one commit) once this many credit and image
+# rows are pending
+SEED_FLUSH_ROWS = 5000
+
+# Rows fetched per round of the streaming 'movies' scan
+MOVIE_SCAN_BATCH = 1000
+
+# Worker threads fetching per-movie TMDb data ahead of the single DB writer.
+# All of them share api_data_retrieve's rate limiter, so this bounds
+# in-flight latency, not the request rate.
+SEED_FETCH_WORKERS = int(os.getenv("SEED_FETCH_WORKERS", "8"))
+
+# Seeding fetches each movie once, so it calls the by-id getters without
+# their per-process caches, which would keep every response alive to the end
+_fetch_credits = get_movie_credits.__wrapped__
+_fetch_images = get_movie_images.__wrapped__
+
 
 def get_db_connection():
     """
-    Creates and returns a MySQL database connection.
-    Adjust host, user, password, and db name as needed.
+    Returns a MySQL database connection taken from a shared pool.
+    The pool is sized by DB_POOL_SIZE (default 10); calling close() on the
+    returned connection hands it back to the pool instead of dropping it.
+    Autocommit is off: seeding code commits explicitly at chunk boundaries.
     """
+    global _POOL
     try:
-        conn = mysql.connector.connect(
-            host=os.getenv("MYSQL_HOST"),
-            user=os.getenv("MYSQL_USER"),
-            password=os.getenv("MYSQL_PASSWORD"),
-            database=os.getenv("MYSQL_DATABASE")
-        )
+        if _POOL is None:
+            _POOL = pooling.MySQLConnectionPool(
+                pool_name="movie_db",
+                pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+                host=os.getenv("MYSQL_HOST"),
+                user=os.getenv("MYSQL_USER"),
+                password=os.getenv("MYSQL_PASSWORD"),
+                database=os.getenv("MYSQL_DATABASE"),
+                autocommit=False
+            )
+        conn = _POOL.get_connection()
         if conn.is_connected():
             return conn
     except Error as e:
-        print(f"Error connecting to DB: {e}")
+        logger.error("Error connecting to DB: %s", e)
     return None
 
 
+def execute_many(connection, query, seq_of_params, batch_size=1000,
+                 commit=True):
+    """
+    Runs `query` for every parameter tuple in `seq_of_params` on `connection`,
+    sending them through cursor.executemany in slices of `batch_size` and
+    committing once at the end. Rolls back and re-raises if any slice fails.
+
+    For a plain INSERT ... VALUES (...) query, mysql-connector rewrites each
+    slice into a single multi-row INSERT, so `batch_size` also bounds the
+    statement size well below max_allowed_packet.
+
+    With commit=False the rows are left in the open transaction for the
+    caller to commit at its own chunk boundary; a failing slice is then
+    only re-raised, leaving earlier work in the transaction untouched.
+
+    Returns the number of parameter tuples sent.
+    """
+    cursor = connection.cursor()
+    rows = iter(seq_of_params)
+    total = 0
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            cursor.executemany(query, batch)
+            total += len(batch)
+        if commit:
+            connection.commit()
+    except Exception:
+        if commit:
+            connection.rollback()
+        raise
+    finally:
+        cursor.close()
+    return total
+
+
+def _iter_movie_ids():
+    """
+    Yields the TMDb movieId of every row in 'movies'; the tables that hang
+    off 'movies' reference it by that key.
+
+    The rows are streamed with an unbuffered cursor on a separate pooled
+    connection: the first API call can start before the scan finishes, the
+    table is never held in memory at once, and the caller's connection stays
+    free for inserts while the result set is still open.
+    """
+    connection = get_db_connection()
+    if not connection:
+        raise Error("Failed to connect to DB for reading movies.")
+
+    cursor = connection.cursor(buffered=False)
+    try:
+        cursor.execute("SELECT movieId FROM movies")
+        # Pull rows in large blocks rather than one fetchone() per row
+        while rows := cursor.fetchmany(MOVIE_SCAN_BATCH):
+            for (movie_id,) in rows:
+                yield movie_id
+    finally:
+        # Drain whatever is left if the caller stopped early
+        connection.consume_results()
+        cursor.close()
+        connection.close()
+
+
+def _prefetch(fetch, items, workers=SEED_FETCH_WORKERS):
+    """
+    Yields (item, future) for every item in `items`, in order, where the
+    future resolves to fetch(item) on a pool of `workers` threads.
+
+    At most 2 * `workers` fetches are submitted ahead of the consumer, so the
+    TMDb round trips overlap each other while the caller (the only thread
+    touching the DB connection) stays in control of batching and commits.
+    """
+    window = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for item in items:
+            window.append((item, executor.submit(fetch, item)))
+            if len(window) >= 2 * workers:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+
+
+# TMDb fields copied into 'movies' and 'images' rows, in column order.
+# itemgetter pulls them out in one C-level call instead of a .get() each.
+_MOVIE_KEYS = (
+    "id",                    # movieId (TMDb ID)
+    "adult",
+    "backdrop_path",
+    "original_language",
+    "original_title",
+    "overview",
+    "popularity",
+    "poster_path",
+    "release_date",
+    "title",
+    "video",
+    "vote_average",
+    "vote_count",
+)
+_MOVIE_FIELDS = itemgetter(*_MOVIE_KEYS)
+_RELEASE_DATE_INDEX = _MOVIE_KEYS.index("release_date")
+
+_IMAGE_KEYS = (
+    "file_path",
+    "aspect_ratio",
+    "height",
+    "width",
+    "vote_average",
+    "vote_count",
+    "iso_639_1",
+)
+_IMAGE_FIELDS = itemgetter(*_IMAGE_KEYS)
+
+
+def _pick(fields, keys, record):
+    """
+    Returns fields(record), falling back to record.get() (None for missing
+    keys) on the rare TMDb record that leaves a field out.
+    """
+    try:
+        return fields(record)
+    except KeyError:
+        return tuple(record.get(key) for key in keys)
+
+
+def _coerce_movie_row(movie):
+    """
+    Maps a TMDb movie dict to a row tuple for the 'movies' table.
+    release_date is parsed here rather than by MySQL, so empty or malformed
+    dates are stored as NULL instead of failing the insert.
+    """
+    row = _pick(_MOVIE_FIELDS, _MOVIE_KEYS, movie)
+
+    release_date = row[_RELEASE_DATE_INDEX]
+    try:
+        release_date = date.fromisoformat(release_date) if release_date else None
+    except ValueError:
+        logger.warning("Invalid release_date %r for movie %s, storing NULL.",
+                       release_date, row[0])
+        release_date = None
+
+    return (row[:_RELEASE_DATE_INDEX] + (release_date,)
+            + row[_RELEASE_DATE_INDEX + 1:])
+
+
+def _credit_rows(movie_id, credits_data):
+    """
+    Maps a TMDb credits response to ('persons' rows, 'movie_credits' rows)
+    for the movie whose TMDb ID is `movie_id`.
+    """
+    persons = []
+    credits = []
+
+    # Process cast
+    for cast_member in credits_data.get("cast", []):
+        person_id = cast_member.get("id")
+        credit_id = cast_member.get("credit_id")
+
+        # Person record
+        persons.append((
+            person_id,
+            cast_member.get("name"),
+            cast_member.get("original_name"),
+            cast_member.get("gender"),
+            cast_member.get("popularity"),
+            cast_member.get("profile_path"),
+            cast_member.get("known_for_department", "Acting")
+        ))
+
+        # Credit record
+        credits.append((
+            credit_id,
+            movie_id,
+            person_id,
+            "cast",
+            cast_member.get("order"),
+            cast_member.get("character"),
+            None,  # department (NULL for cast)
+            None   # job (NULL for cast)
+        ))
+
+    # Process crew
+    for crew_member in credits_data.get("crew", []):
+        person_id = crew_member.get("id")
+        credit_id = crew_member.get("credit_id")
+
+        persons.append((
+            person_id,
+            crew_member.get("name"),
+            crew_member.get("original_name"),
+            crew_member.get("gender"),
+            crew_member.get("popularity"),
+            crew_member.get("profile_path"),
+            crew_member.get("known_for_department", "Production")
+        ))
+
+        credits.append((
+            credit_id,
+            movie_id,
+            person_id,
+            "crew",
+            None,
+            None,
+            crew_member.get("department"),
+            crew_member.get("job")
+        ))
+
+    return persons, credits
+
+
+def _image_rows(movie_id, images_data):
+    """
+    Maps a TMDb images response to 'images' rows for the movie whose TMDb
+    ID is `movie_id`.
+    """
+    rows = []
+    for image_type in ['backdrops', 'logos', 'posters']:
+        # remove trailing 's' to get singular type
+        normalized_type = (image_type[:-1]
+                           if image_type.endswith('s')
+                           else image_type)
+        for img in images_data.get(image_type, []):
+            rows.append((movie_id, normalized_type)
+                        + _pick(_IMAGE_FIELDS, _IMAGE_KEYS, img))
+    return rows
+
+
+# Statements shared by the cast/crew and image seeders. Duplicates are
+# resolved by ON DUPLICATE KEY UPDATE on each table's unique key rather than
+# INSERT IGNORE, so only a duplicate is absorbed and any other bad row still
+# raises; the mutable TMDb stats are refreshed on a re-seed.
+PERSONS_INSERT_QUERY = """
+    INSERT INTO persons
+    (id, name, original_name, gender, popularity, profile_path, known_for_department)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE popularity = VALUES(popularity)
+"""
+
+CREDITS_INSERT_QUERY = """
+    INSERT INTO movie_credits
+    (credit_id, movie_id, person_id, type, cast_order, character_name, department, job)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE credit_id = credit_id
+"""
+
+IMAGES_INSERT_QUERY = """
+    INSERT INTO images
+    (movie_id, type, file_path, aspect_ratio, height, width,
+    vote_average, vote_count, iso_639_1)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE vote_average = VALUES(vote_average),
+                            vote_count = VALUES(vote_count)
+"""
+
+# Progress rows, written in the same transaction as the rows they describe
+# so a resumed run can skip exactly the movies that were committed
+SEEDED_INSERT_QUERY = """
+    INSERT IGNORE INTO seeded_movies (movie_id, stage)
+    VALUES (%s, %s)
+"""
+
+
+def _insert_persons_and_credits(connection, persons, credits, seen_persons):
+    """
+    Sends pending 'persons' and 'movie_credits' rows without committing.
+    The same person shows up across movies and as both cast and crew; each
+    person_id is sent once (first row wins), and ids already in
+    `seen_persons` are not sent again at all. Credits are likewise sent
+    once per credit_id.
+
+    Returns the person ids sent, for the caller to add to `seen_persons`
+    once they are committed.
+    """
+    unique_persons = {}
+    for person in persons:
+        if person[0] not in seen_persons:
+            unique_persons.setdefault(person[0], person)
+
+    unique_credits = {}
+    for credit in credits:
+        unique_credits.setdefault(credit[0], credit)
+
+    # persons first: credits reference them
+    execute_many(connection, PERSONS_INSERT_QUERY, unique_persons.values(),
+                 commit=False)
+    execute_many(connection, CREDITS_INSERT_QUERY, unique_credits.values(),
+                 commit=False)
+    return unique_persons.keys()
+
+
+def _write_seed_rows(connection, movies, seen_persons):
+    """
+    Sends the rows collected for `movies`, a list of
+    (movie_id, persons, credits, images, seeded) tuples, and commits them
+    as one transaction; the person ids sent are then added to
+    `seen_persons`.
+    """
+    persons = [row for movie in movies for row in movie[1]]
+    credits = [row for movie in movies for row in movie[2]]
+    images = [row for movie in movies for row in movie[3]]
+    seeded = [row for movie in movies for row in movie[4]]
+
+    sent_persons = _insert_persons_and_credits(connection, persons, credits,
+                                               seen_persons)
+    execute_many(connection, IMAGES_INSERT_QUERY, images, commit=False)
+    execute_many(connection, SEEDED_INSERT_QUERY, seeded, commit=False)
+    connection.commit()
+    seen_persons.update(sent_persons)
+
+
+def _flush_seed_rows(connection, movies, seen_persons):
+    """
+    Writes the rows collected for `movies` (see _write_seed_rows) and
+    clears the list.
+
+    If the server rejects the batch (e.g. a value too long for its column
+    in strict mode), it is rolled back and written again one movie at a
+    time, so only the movies whose own rows fail are lost. Those are logged
+    and get no 'seeded_movies' row; the rest of the seed carries on.
+    """
+    try:
+        _write_seed_rows(connection, movies, seen_persons)
+    except Error as e:
+        connection.rollback()
+        logger.warning("Batch of %d movies failed (%s), "
+                       "retrying one movie at a time.", len(movies), e)
+        for movie in movies:
+            try:
+                _write_seed_rows(connection, [movie], seen_persons)
+            except Error as ex:
+                connection.rollback()
+                logger.error("Skipping movie %s, its rows were rejected: %s",
+                             movie[0], ex)
+    movies.clear()
+
+
+def _set_foreign_key_checks(connection, enabled):
+    """
+    Turns foreign_key_checks on or off for the session of `connection`.
+
+    The cast/crew and image seeders switch them off while bulk loading:
+    every row they write points at a 'movies' row they have just read or at
+    a 'persons' row sent ahead of it, so the per-row parent lookups are pure
+    overhead. unique_checks stay on, since the ON DUPLICATE KEY UPDATE
+    dedupe depends on them.
+    """
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            f"SET SESSION foreign_key_checks = {1 if enabled else 0}")
+    finally:
+        cursor.close()
+
+
+def _load_person_ids(cursor):
+    """
+    Returns the set of ids already stored in 'persons', so a resumed
+    cast/crew seed does not send those rows again.
+    """
+    cursor.execute("SELECT id FROM persons")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _load_seeded(cursor, stage):
+    """
+    Returns the TMDb IDs of the movies whose `stage` ('credits' or
+    'images') is already recorded in 'seeded_movies'.
+    """
+    cursor.execute(
+        "SELECT movie_id FROM seeded_movies WHERE stage = %s", (stage,))
+    return {row[0] for row in cursor.fetchall()}
+
+
 #
 # QUERY 1: SEED MOVIES
 #
@@ -48,7 +467,7 @@ def query_1_seed_movies_1():
     """
     connection = get_db_connection()
     if not connection:
-        print("Failed to connect to DB for seeding movies.")
+        logger.error("Failed to connect to DB for seeding movies.")
         return
 
     cursor = connection.cursor()
@@ -57,57 +476,47 @@ def query_1_seed_movies_1():
         cursor.execute("SELECT COUNT(*) FROM movies")
         existing_count = cursor.fetchone()[0]
         if existing_count > 0:
-            print(f"Movies table already contains {
-                  existing_count} records. Skipping seeding.")
+            logger.info("Movies table already contains %d records. "
+                        "Skipping seeding.", existing_count)
             return
 
-        print("Seeding 'movies' data from TMDb API...")
+        logger.info("Seeding 'movies' data from TMDb API...")
         total_pages = 5  # example: fetch 5 pages => ~100 movies
         insert_query = """
-            INSERT IGNORE INTO movies
+            INSERT INTO movies
             (movieId, adult, backdrop_path, original_language, original_title,
             overview, popularity, poster_path, release_date, title, video,
             vote_average, vote_count)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE popularity = VALUES(popularity),
+                                    vote_average = VALUES(vote_average),
+                                    vote_count = VALUES(vote_count)
         """
 
-        for page in range(1, total_pages + 1):
+        # A handful of pages fits in memory, so every row is collected
+        # first and sent as one batched insert with a single commit
+        batch_values = []
+        for page, future in _prefetch(get_movies_by_page,
+                                      range(1, total_pages + 1)):
             try:
-                data = get_movies_by_page(page)
+                data = future.result()
                 movies = data.get("results", [])
-                batch_values = []
-                for movie in movies:
-                    batch_values.append((
-                        movie.get("id"),
-                        movie.get("adult"),
-                        movie.get("backdrop_path"),
-                        movie.get("original_language"),
-                        movie.get("original_title"),
-                        movie.get("overview"),
-                        movie.get("popularity"),
-                        movie.get("poster_path"),
-                        movie.get("release_date"),
-                        movie.get("title"),
-                        movie.get("video"),
-                        movie.get("vote_average"),
-                        movie.get("vote_count")
-                    ))
-                cursor.executemany(insert_query, batch_values)
-                connection.commit()
-                print(f"Seeded page {page} with {len(movies)} movies.")
-
-                # Simple rate-limit: sleep after each page
-                time.sleep(0.5)
+                batch_values.extend(map(_coerce_movie_row, movies))
+                logger.info("Fetched page %d with %d movies.",
+                            page, len(movies))
 
             except Exception as e:
-                print(f"Error fetching page {page}: {e}")
+                logger.error("Error fetching page %d: %s", page, e)
+
+        execute_many(connection, insert_query, batch_values)
+        logger.info("Seeded %d movies.", len(batch_values))
 
     except Exception as e:
-        print("Error seeding movies:", e)
+        logger.error("Error seeding movies: %s", e)
     finally:
         cursor.close()
         connection.close()
-        print("Finished seeding 'movies'.")
+        logger.info("Finished seeding 'movies'.")
 
 
 def query_1_seed_movies():
@@ -118,7 +527,7 @@ def query_1_seed_movies():
     """
     connection = get_db_connection()
     if not connection:
-        print("Failed to connect to DB for seeding movies.")
+        logger.error("Failed to connect to DB for seeding movies.")
         return
 
     cursor = connection.cursor()
@@ -127,21 +536,25 @@ def query_1_seed_movies():
         cursor.execute("SELECT COUNT(*) FROM movies")
         existing_count = cursor.fetchone()[0]
         if existing_count > 0:
-            print(f"Movies table already contains {
-                  existing_count} records. Skipping seeding.")
+            logger.info("Movies table already contains %d records. "
+                        "Skipping seeding.", existing_count)
             return
 
-        print("Seeding 'movies' data from TMDb API...")
+        logger.info("Seeding 'movies' data from TMDb API...")
         total_pages = 250  # e.g., fetch 5 pages => ~100 movies
 
         # 1) Insert query for 'movies'
         insert_movies_query = """
-            INSERT IGNORE INTO movies
+            INSERT INTO movies
                 (movieId, adult, backdrop_path, original_language, original_title,
                  overview, popularity, poster_path, release_date, title, video,
                  vote_average, vote_count)
             VALUES
                 (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                popularity = VALUES(popularity),
+                vote_average = VALUES(vote_average),
+                vote_count = VALUES(vote_count)
         """
 
         # 2) Insert query for 'movie_genres'
@@ -150,79 +563,59 @@ def query_1_seed_movies():
             VALUES (%s, %s)
         """
 
-        for page in range(1, total_pages + 1):
+        # Pages are fetched ahead on worker threads; inserts and commits
+        # still happen here, in page order
+        for page, future in _prefetch(get_movies_by_page,
+                                      range(1, total_pages + 1)):
             try:
-                data = get_movies_by_page(page)
+                data = future.result()
                 movies = data.get("results", [])
 
                 if not movies:
-                    print(f"No movies found on page {page}.")
+                    logger.warning("No movies found on page %d.", page)
                     continue
 
                 # --- A) Insert the movies in bulk ---
-                batch_values = []
-                for movie in movies:
-                    batch_values.append((
-                        movie.get("id"),                    # movieId (TMDb ID)
-                        movie.get("adult"),
-                        movie.get("backdrop_path"),
-                        movie.get("original_language"),
-                        movie.get("original_title"),
-                        movie.get("overview"),
-                        movie.get("popularity"),
-                        movie.get("poster_path"),
-                        movie.get("release_date"),
-                        movie.get("title"),
-                        movie.get("video"),
-                        movie.get("vote_average"),
-                        movie.get("vote_count")
-                    ))
-                cursor.executemany(insert_movies_query, batch_values)
-                connection.commit()
-
-                # --- B) For each inserted movie, insert genres ---
+                batch_values = map(_coerce_movie_row, movies)
+                execute_many(connection, insert_movies_query, batch_values,
+                             commit=False)
+
+                # --- B) For each inserted movie, collect its genres ---
+                genre_values = []
                 for movie in movies:
                     tmdb_id = movie.get("id")  # same as movieId
                     genre_ids = movie.get("genre_ids", [])  # e.g. [35,18]
 
                     if not genre_ids:
-                        print(f"No genres found for movie {tmdb_id}.")
+                        logger.debug("No genres found for movie %s.", tmdb_id)
                         continue  # skip if no genres
 
-                    # print the genre_ids for each movie
-                    print(f"Genres for movie {tmdb_id}: {genre_ids}")
-                    # Find the local auto-increment ID from 'movies'
-                    cursor.execute(
-                        "SELECT id FROM movies WHERE movieId = %s LIMIT 1",
-                        (tmdb_id,)
-                    )
-                    result = cursor.fetchone()
-                    if not result:
-                        # Should not happen if the INSERT worked, but just in case
-                        continue
-                    local_movie_id = result[0]
-
-                    # Insert each genre into the join table
-                    for g_id in genre_ids:
-                        cursor.execute(insert_movie_genres_query,
-                                       (local_movie_id, g_id))
-
-                connection.commit()
-
-                print(f"Seeded page {page} with {
-                      len(movies)} movies (including genres).")
-                # Simple rate-limit: sleep after each page
-                time.sleep(0.5)
+                    logger.debug("Genres for movie %s: %s", tmdb_id, genre_ids)
+                    genre_values.extend(
+                        (tmdb_id, g_id) for g_id in genre_ids)
+
+                # Insert the whole page's genres as one multi-row INSERT
+                execute_many(connection, insert_movie_genres_query,
+                             genre_values, commit=False)
+
+                # One transaction per COMMIT_EVERY_PAGES pages
+                if page % COMMIT_EVERY_PAGES == 0:
+                    connection.commit()
+
+                logger.info("Seeded page %d with %d movies (including genres).",
+                            page, len(movies))
 
             except Exception as e:
-                print(f"Error on page {page}: {e}")
+                logger.error("Error on page %d: %s", page, e)
+
+        connection.commit()
 
     except Exception as e:
-        print("Error seeding movies:", e)
+        logger.error("Error seeding movies: %s", e)
     finally:
         cursor.close()
         connection.close()
-        print("Finished seeding 'movies' and 'movie_genres'.")
+        logger.info("Finished seeding 'movies' and 'movie_genres'.")
 
 
 #
@@ -234,7 +627,7 @@ def query_2_seed_genres():
     """
     connection = get_db_connection()
     if not connection:
-        print("Failed to connect to DB for seeding genres.")
+        logger.error("Failed to connect to DB for seeding genres.")
         return
 
     cursor = connection.cursor()
@@ -243,11 +636,11 @@ def query_2_seed_genres():
         cursor.execute("SELECT COUNT(*) FROM genres")
         existing_count = cursor.fetchone()[0]
         if existing_count > 0:
-            print(f"Genres table already contains {
-                  existing_count} records. Skipping seeding.")
+            logger.info("Genres table already contains %d records. "
+                        "Skipping seeding.", existing_count)
             return
 
-        print("Seeding 'genres' data from TMDb API...")
+        logger.info("Seeding 'genres' data from TMDb API...")
         data = get_all_genres()
         genres = data.get("genres", [])
 
@@ -257,15 +650,14 @@ def query_2_seed_genres():
             ON DUPLICATE KEY UPDATE name = VALUES(name)
         """
         batch_values = [(g["id"], g["name"]) for g in genres]
-        cursor.executemany(insert_query, batch_values)
-        connection.commit()
-        print(f"Seeded {len(genres)} genres.")
+        execute_many(connection, insert_query, batch_values)
+        logger.info("Seeded %d genres.", len(genres))
     except Exception as e:
-        print("Error seeding genres:", e)
+        logger.error("Error seeding genres: %s", e)
     finally:
         cursor.close()
         connection.close()
-        print("Finished seeding 'genres'.")
+        logger.info("Finished seeding 'genres'.")
 
 
 #
@@ -276,132 +668,7 @@ def query_3_seed_cast_and_crew():
     For each movie in 'movies', fetch the cast & crew from the TMDb API
     and insert them into 'persons' and 'movie_credits' tables.
     """
-    connection = get_db_connection()
-    if not connection:
-        print("Failed to connect to DB for seeding cast and crew.")
-        return
-
-    cursor = connection.cursor(dictionary=True)
-    try:
-
-        cursor.execute("SELECT COUNT(*) AS count FROM persons")
-        count_result = cursor.fetchone()
-        if count_result and count_result["count"] > 0:
-            print(f"'persons' table already contains {
-                  count_result['count']} records. Skipping cast/crew seeding.")
-            return
-
-        cursor.execute("SELECT id, movieId FROM movies")
-        movie_rows = cursor.fetchall()
-        total_movies = len(movie_rows)
-        print(f"Seeding cast and crew for {total_movies} movies...")
-
-        # Prepare SQL for inserting persons
-        persons_insert_query = """
-            INSERT IGNORE INTO persons
-            (id, name, original_name, gender, popularity, profile_path, known_for_department)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        # Prepare SQL for inserting into movie_credits
-        credits_insert_query = """
-            INSERT IGNORE INTO movie_credits
-            (credit_id, movie_id, person_id, type, cast_order, character_name, department, job)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        # Rate-limiting counters
-        requests_count = 0
-
-        for idx, movie in enumerate(movie_rows, start=1):
-            db_movie_id = movie["id"]       # local DB ID
-            api_movie_id = movie["movieId"]  # TMDb ID
-
-            try:
-                credits_data = get_movie_credits(api_movie_id)
-
-                # Cast batch
-                persons_batch = []
-                credits_batch = []
-
-                # Process cast
-                for cast_member in credits_data.get("cast", []):
-                    person_id = cast_member.get("id")
-                    credit_id = cast_member.get("credit_id")
-
-                    # Person record
-                    persons_batch.append((
-                        person_id,
-                        cast_member.get("name"),
-                        cast_member.get("original_name"),
-                        cast_member.get("gender"),
-                        cast_member.get("popularity"),
-                        cast_member.get("profile_path"),
-                        cast_member.get("known_for_department", "Acting")
-                    ))
-
-                    # Credit record
-                    credits_batch.append((
-                        credit_id,
-                        db_movie_id,
-                        person_id,
-                        "cast",
-                        cast_member.get("order"),
-                        cast_member.get("character"),
-                        None,  # department (NULL for cast)
-                        None   # job (NULL for cast)
-                    ))
-
-                # Process crew
-                for crew_member in credits_data.get("crew", []):
-                    person_id = crew_member.get("id")
-                    credit_id = crew_member.get("credit_id")
-
-                    persons_batch.append((
-                        person_id,
-                        crew_member.get("name"),
-                        crew_member.get("original_name"),
-                        crew_member.get("gender"),
-                        crew_member.get("popularity"),
-                        crew_member.get("profile_path"),
-                        crew_member.get("known_for_department", "Production")
-                    ))
-
-                    credits_batch.append((
-                        credit_id,
-                        db_movie_id,
-                        person_id,
-                        "crew",
-                        None,
-                        None,
-                        crew_member.get("department"),
-                        crew_member.get("job")
-                    ))
-
-                # Execute batch inserts
-                if persons_batch:
-                    cursor.executemany(persons_insert_query, persons_batch)
-                if credits_batch:
-                    cursor.executemany(credits_insert_query, credits_batch)
-                connection.commit()
-
-                requests_count += 1
-                # Simple rate limit
-                if requests_count % 10 == 0:
-                    time.sleep(1)
-
-                print(
-                    f"Seeded cast/crew for movie {api_movie_id} ({idx}/{total_movies}).")
-
-            except Exception as ex:
-                print(
-                    f"Error seeding cast/crew for movie {api_movie_id}: {ex}")
-
-    except Exception as e:
-        print("Error fetching movies from DB:", e)
-    finally:
-        cursor.close()
-        connection.close()
-        print("Finished seeding 'cast and crew'.")
+    query_3_4_seed_credits_and_images(images=False)
 
 
 #
@@ -412,81 +679,123 @@ def query_4_seed_images():
     For each movie in 'movies', fetch images from the TMDb API
     and insert them into the 'images' table.
     """
+    query_3_4_seed_credits_and_images(credits=False)
+
+
+#
+# QUERY 3+4: SEED CAST & CREW AND IMAGES IN ONE PASS
+#
+def query_3_4_seed_credits_and_images(credits=True, images=True):
+    """
+    Seeds cast & crew ('persons', 'movie_credits') and/or images ('images')
+    in a single walk over 'movies': the parts selected by `credits` and
+    `images` are fetched from the TMDb API on a pool of worker threads, and
+    their rows are flushed together in one transaction per batch.
+    Movies recorded in 'seeded_movies' are skipped per part, so an
+    interrupted run resumes where it stopped; a part whose table is
+    populated but has no progress rows was seeded in one go and is skipped.
+    """
+    label = " and ".join(name for name, wanted in (("cast/crew", credits),
+                                                   ("images", images))
+                         if wanted)
+
     connection = get_db_connection()
     if not connection:
-        print("Failed to connect to DB for seeding images.")
+        logger.error("Failed to connect to DB for seeding %s.", label)
         return
 
-    cursor = connection.cursor(dictionary=True)
+    cursor = connection.cursor()
     try:
-        # 1) Check if 'images' table already has records
-        cursor.execute("SELECT COUNT(*) AS count FROM images")
-        img_count = cursor.fetchone()["count"]
-        if img_count > 0:
-            print(f"'images' table already contains {
-                  img_count} records. Skipping images seeding.")
+        seed_credits = seed_images = False
+        credits_done, images_done = set(), set()
+        if credits:
+            cursor.execute("SELECT COUNT(*) FROM persons")
+            persons_count = cursor.fetchone()[0]
+            credits_done = _load_seeded(cursor, "credits")
+            seed_credits = persons_count == 0 or bool(credits_done)
+            if not seed_credits:
+                logger.info("'persons' table already contains %d records. "
+                            "Skipping cast/crew seeding.", persons_count)
+        if images:
+            cursor.execute("SELECT COUNT(*) FROM images")
+            images_count = cursor.fetchone()[0]
+            images_done = _load_seeded(cursor, "images")
+            seed_images = images_count == 0 or bool(images_done)
+            if not seed_images:
+                logger.info("'images' table already contains %d records. "
+                            "Skipping images seeding.", images_count)
+
+        if not (seed_credits or seed_images):
             return
 
-        cursor.execute("SELECT id, movieId FROM movies")
-        movie_rows = cursor.fetchall()
-        total_movies = len(movie_rows)
-        print(f"Seeding images for {total_movies} movies...")
-
-        insert_query = """
-            INSERT IGNORE INTO images
-            (movie_id, type, file_path, aspect_ratio, height, width,
-            vote_average, vote_count, iso_639_1)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        requests_count = 0
-
-        for idx, movie in enumerate(movie_rows, start=1):
-            db_movie_id = movie["id"]
-            api_movie_id = movie["movieId"]
-
+        cursor.execute("SELECT COUNT(*) FROM movies")
+        total_movies = cursor.fetchone()[0]
+        logger.info("Seeding %s for %d movies...", label, total_movies)
+
+        _set_foreign_key_checks(connection, False)
+
+        # Per-movie rows accumulated until the next flush
+        batch = []
+        batch_rows = 0
+        # person_ids already in 'persons', from an earlier run or this one
+        seen_persons = _load_person_ids(cursor) if seed_credits else set()
+
+        def pending_movies():
+            for idx, movie_id in enumerate(_iter_movie_ids(), start=1):
+                want_credits = seed_credits and movie_id not in credits_done
+                want_images = seed_images and movie_id not in images_done
+                if want_credits or want_images:
+                    yield idx, movie_id, want_credits, want_images
+
+        def fetch_movie(movie):
+            # Images come from /images rather than append_to_response, which
+            # filters them by language; the table keeps every language
+            _, movie_id, want_credits, want_images = movie
+            return (_fetch_credits(movie_id) if want_credits else None,
+                    _fetch_images(movie_id) if want_images else None)
+
+        for movie, future in _prefetch(fetch_movie, pending_movies()):
+            idx, movie_id, _, _ = movie
             try:
-                images_data = get_movie_images(api_movie_id)
-
-                batch_values = []
-                for image_type in ['backdrops', 'logos', 'posters']:
-                    for img in images_data.get(image_type, []):
-                        # remove trailing 's' to get singular type
-                        normalized_type = (image_type[:-1]
-                                           if image_type.endswith('s')
-                                           else image_type)
-                        batch_values.append((
-                            db_movie_id,
-                            normalized_type,
-                            img.get("file_path"),
-                            img.get("aspect_ratio"),
-                            img.get("height"),
-                            img.get("width"),
-                            img.get("vote_average"),
-                            img.get("vote_count"),
-                            img.get("iso_639_1")
-                        ))
-
-                if batch_values:
-                    cursor.executemany(insert_query, batch_values)
-                    connection.commit()
+                credits_data, images_data = future.result()
+
+                # Build every row before touching the batch, so a failed
+                # request leaves no half-seeded movie
+                movie_persons, movie_credits, movie_images = [], [], []
+                movie_seeded = []
+                if credits_data is not None:
+                    movie_persons, movie_credits = _credit_rows(movie_id,
+                                                                credits_data)
+                    movie_seeded.append((movie_id, "credits"))
+                if images_data is not None:
+                    movie_images = _image_rows(movie_id, images_data)
+                    movie_seeded.append((movie_id, "images"))
+
+                batch.append((movie_id, movie_persons, movie_credits,
+                              movie_images, movie_seeded))
+                batch_rows += len(movie_credits) + len(movie_images)
+
+                logger.debug("Collected %s for movie %s (%d/%d).",
+                             label, movie_id, idx, total_movies)
 
-                requests_count += 1
-                if requests_count % 10 == 0:
-                    time.sleep(1)
+            except Exception as ex:
+                logger.error("Error seeding %s for movie %s: %s",
+                             label, movie_id, ex)
 
-                print(f"Seeded images for movie {
-                      api_movie_id} ({idx}/{total_movies}).")
+            if batch_rows >= SEED_FLUSH_ROWS:
+                _flush_seed_rows(connection, batch, seen_persons)
+                batch_rows = 0
 
-            except Exception as ex:
-                print(f"Error seeding images for movie {api_movie_id}: {ex}")
+        _flush_seed_rows(connection, batch, seen_persons)
 
     except Exception as e:
-        print("Error fetching movies from DB:", e)
+        logger.error("Error seeding %s: %s", label, e)
     finally:
+        if connection.is_connected():
+            _set_foreign_key_checks(connection, True)
         cursor.close()
         connection.close()
-        print("Finished seeding 'images'.")
+        logger.info("Finished seeding %s.", label)
 
 
 #
@@ -501,7 +810,7 @@ def query_5_example_report():
     """
     connection = get_db_connection()
     if not connection:
-        print("Failed to connect for query_5_example_report.")
+        logger.error("Failed to connect for query_5_example_report.")
         return []
 
     cursor = connection.cursor(dictionary=True)
@@ -515,19 +824,98 @@ def query_5_example_report():
         results = cursor.fetchall()
         return results
     except Error as e:
-        print(f"Error running query_5_example_report: {e}")
+        logger.error("Error running query_5_example_report: %s", e)
         return []
     finally:
         cursor.close()
         connection.close()
 
 
+#
+# QUERY 6: REFRESH THE GENRE SUMMARY
+#
+def refresh_genre_top_movie():
+    """
+    Rebuilds 'mv_genre_top_movie' (movie count and most popular title per
+    genre) from the seeded data. Query #2 in queries_execution.py reads this
+    table instead of aggregating movie_genres x movies on every call.
+    The rebuild runs in one transaction, so readers see either the old or
+    the new summary.
+    """
+    connection = get_db_connection()
+    if not connection:
+        logger.error("Failed to connect to DB for refreshing genre summary.")
+        return
+
+    cursor = connection.cursor()
+    try:
+        # DELETE rather than TRUNCATE: TRUNCATE commits implicitly
+        cursor.execute("DELETE FROM mv_genre_top_movie")
+        cursor.execute("""
+            INSERT INTO mv_genre_top_movie
+                (genre_id, genre_name, movie_count, most_popular_movie)
+            SELECT g.id, g.name, ranked.movie_count, ranked.title
+            FROM (
+                SELECT mg.genre_id,
+                       m.title,
+                       COUNT(*) OVER (PARTITION BY mg.genre_id) AS movie_count,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY mg.genre_id
+                           ORDER BY m.popularity DESC
+                       ) AS rn
+                FROM movie_genres mg
+                JOIN movies m ON m.movieId = mg.movie_id
+            ) ranked
+            JOIN genres g ON g.id = ranked.genre_id
+            WHERE ranked.rn = 1
+        """)
+        connection.commit()
+        logger.info("Refreshed genre summary for %d genres.",
+                    cursor.rowcount)
+    except Error as e:
+        connection.rollback()
+        logger.error("Error refreshing genre summary: %s", e)
+    finally:
+        cursor.close()
+        connection.close()
+
+
+def _schema_is_current():
+    """
+    Checks that the child tables reference movies.movieId. The seeders
+    write TMDb ids into them with foreign_key_checks off, so on an older
+    schema (keyed on movies.id) they would store wrong references silently.
+    """
+    connection = get_db_connection()
+    if not connection:
+        logger.error("Failed to connect to DB for checking the schema.")
+        return False
+
+    cursor = connection.cursor()
+    try:
+        stale = find_stale_movie_refs(cursor)
+    finally:
+        cursor.close()
+        connection.close()
+
+    if stale:
+        logger.error("Tables %s reference movies.id from an older schema; "
+                     "drop the database and re-create it with "
+                     "create_db_script.py before seeding.", ", ".join(stale))
+        return False
+    return True
+
+
 def main():
     """
     Demonstrates calling each query (i.e., each 'seeding' routine)
     in sequence, plus an example read-only query.
     """
-    print("Starting DB seeding / queries...")
+    logger.info("Starting DB seeding / queries...")
+
+    # 0) Refuse to seed a database created with the old movie references
+    if not _schema_is_current():
+        return
 
     # 1) Seed the 'genres' table
     query_2_seed_genres()
@@ -535,11 +923,11 @@ def main():
     # 2) Seed the 'movies' table
     query_1_seed_movies()
 
-    # 3) Seed cast & crew
-    query_3_seed_cast_and_crew()
+    # 3) + 4) Seed cast & crew and images in a single pass over the movies
+    query_3_4_seed_credits_and_images()
 
-    # 4) Seed images
-    query_4_seed_images()
+    # 6) Rebuild the precomputed genre summary from the seeded data
+    refresh_genre_top_movie()
 
     # 5) Run an example read query
     top_5 = query_5_example_report()
@@ -548,8 +936,9 @@ def main():
         print(f" - {row['title']} (popularity: {row['popularity']
                                                 }, vote_count: {row['vote_count']})")
 
-    print("All queries finished.")
+    logger.info("All queries finished.")
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
     main()
@@ -1,29 +1,191 @@
 import os
-import mysql.connector
-from mysql.connector import Error
+import functools
+import re
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from time import monotonic
+from mysql.connector import Error, pooling
 from dotenv import load_dotenv
-from contextlib import redirect_stdout
 
 
-load_dotenv(verbose=True, override=True)
+# Environment is read once at import: values already set in the process
+# (e.g. by a server that preloads this module) win over .env, and a missing
+# MySQL setting fails here with a KeyError rather than on the first query.
+load_dotenv(override=False)
 
+_DB_CONFIG = {
+    "host": os.environ["MYSQL_HOST"],
+    "user": os.environ["MYSQL_USER"],
+    "password": os.environ["MYSQL_PASSWORD"],
+    "database": os.environ["MYSQL_DATABASE"],
+}
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "10"))
 
-def get_db_connection():
+# Word tokens accepted in a full-text search; \w is Unicode-aware, so this
+# covers Hebrew titles too. Everything else (Boolean-mode operators such as
+# + - " ( ) ~ < > @ and stray punctuation) is dropped before it reaches
+# MySQL, where it could otherwise fail to parse.
+_SAFE_TOKEN = re.compile(r"\w+")
+
+# Boolean-mode syntax: a + or - at the start of a term, a quote or a *.
+# A hyphen inside a word ("Spider-Man") is not an operator; input without
+# any of these is searched in natural language mode instead (see
+# query_3_fulltext_search_in_title).
+_BOOL_OPS = re.compile(r'(?:^|\s)[+-]|["*]')
+
+# One Boolean-mode term: an optional leading +/-, then a quoted phrase
+# (the closing quote may be missing) or a run of non-space characters
+_BOOL_TERM = re.compile(r'([+-]?)(?:"([^"]*)"?|([^\s"]+))')
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_search_term(substring):
+    """
+    Turns raw search input into (boolean_mode, term) for Query #3.
+    In Boolean mode each term keeps its leading - (excluded) and is
+    otherwise required; a single word becomes a prefix term, while a quoted
+    phrase or a word with inner punctuation becomes an exact phrase
+    ('batman -lego "dark knight"' -> '+batman* -lego* +"dark knight"').
+    Otherwise the tokens are joined as plain words. The term is "" when the
+    input has no word tokens.
+    Cached, since the same inputs tend to repeat (e.g. autocomplete).
+    """
+    if not _BOOL_OPS.search(substring):
+        return False, " ".join(_SAFE_TOKEN.findall(substring))
+
+    terms = []
+    for op, phrase, word in _BOOL_TERM.findall(substring):
+        tokens = _SAFE_TOKEN.findall(phrase or word)
+        if not tokens:
+            continue
+        op = op or "+"
+        if phrase or len(tokens) > 1:
+            terms.append(f'{op}"{" ".join(tokens)}"')
+        else:
+            terms.append(f"{op}{tokens[0]}*")
+    if not any(term.startswith("+") for term in terms):
+        # MySQL matches nothing when every term is excluded
+        return True, ""
+    return True, " ".join(terms)
+
+
+# Row types returned by the queries. The columns of each result are fixed,
+# so rows come off a plain tuple cursor and are wrapped here instead of
+# having the connector build a dict per row.
+MovieActor = namedtuple(
+    "MovieActor", ["movie_title", "actor_name", "actor_popularity"])
+GenreSummary = namedtuple(
+    "GenreSummary", ["genre_name", "movie_count", "most_popular_movie"])
+MovieMatch = namedtuple("MovieMatch", ["id", "title", "popularity"])
+RoleCount = namedtuple("RoleCount", ["category", "total"])
+
+# Child tables whose foreign key to 'movies' does not target movies.movieId;
+# same check as create_db_script.STALE_MOVIE_REFS_QUERY (not imported, as
+# that module reloads .env with override=True)
+_SQL_STALE_MOVIE_REFS = """
+    SELECT DISTINCT TABLE_NAME
+    FROM information_schema.KEY_COLUMN_USAGE
+    WHERE TABLE_SCHEMA = DATABASE()
+      AND REFERENCED_TABLE_NAME = 'movies'
+      AND REFERENCED_COLUMN_NAME <> 'movieId';
+"""
+
+# Shared connection pool, created on first use so that importing this module
+# does not require the database to be reachable yet. The lock keeps
+# concurrent first calls (see run_all_queries) from creating it twice.
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    """
+    Returns the shared connection pool, creating it on first call from the
+    env variables captured at import: MYSQL_HOST, MYSQL_USER,
+    MYSQL_PASSWORD, MYSQL_DATABASE, DB_POOL_SIZE (default 10).
+
+    On creation the schema is checked once: a database whose child tables
+    still reference movies.id (created before they were keyed on the TMDb
+    movieId) would make the joins return wrong rows, so it raises
+    RuntimeError instead.
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            pool = pooling.MySQLConnectionPool(
+                pool_name="movie_db_queries",
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=True,
+                **_DB_CONFIG
+            )
+            conn = pool.get_connection()
+            cursor = conn.cursor()
+            try:
+                cursor.execute(_SQL_STALE_MOVIE_REFS)
+                stale = [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+                conn.close()
+            if stale:
+                raise RuntimeError(
+                    f"Tables {', '.join(sorted(stale))} reference movies.id "
+                    f"from an older schema; drop the database and re-create "
+                    f"it with create_db_script.py, then seed it again.")
+            _POOL = pool
+    return _POOL
+
+
+@contextmanager
+def _pooled_cursor():
     """
-    Returns a MySQL database connection using env variables:
-    MYSQL_HOST, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE.
+    Yields a cursor on a connection taken from the shared pool. On exit the
+    cursor is closed and the connection handed back to the pool on every
+    path; if the block raised, its transaction is rolled back first.
+    Errors getting a connection propagate as mysql.connector.Error.
     """
+    conn = _get_pool().get_connection()
+    cursor = conn.cursor()
     try:
-        conn = mysql.connector.connect(
-            host=os.getenv("MYSQL_HOST"),
-            user=os.getenv("MYSQL_USER"),
-            password=os.getenv("MYSQL_PASSWORD"),
-            database=os.getenv("MYSQL_DATABASE")
-        )
-        return conn
-    except Error as e:
-        print(f"Error connecting to DB: {e}")
-        return None
+        yield cursor
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def ttl_cache(ttl):
+    """
+    Memoizes a function's result per call arguments for `ttl` seconds.
+    Empty results are not cached: the query functions return [] on a DB
+    error, and that should not stick for the whole TTL. Cached
+    lists are shared between callers, so treat them as read-only.
+    """
+    def decorator(fn):
+        cache = {}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = monotonic()
+            with lock:
+                hit = cache.get(key)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = fn(*args, **kwargs)
+            if value:
+                with lock:
+                    cache[key] = (now, value)
+            return value
+        return wrapper
+    return decorator
+
+
+# How long Q1/Q2/Q4 results are reused; the data only changes on re-seed
+RESULT_TTL_SECONDS = 600
 
 # ------------------------------------------------------------------------------
 # QUERY #1 (Complex):
@@ -34,50 +196,55 @@ def get_db_connection():
 #  Output columns: movie_title, actor_name, actor_popularity
 # ------------------------------------------------------------------------------
 
-
+# The top movie is read first (a single read off the descending popularity
+# index), so its title crosses the wire once instead of on every actor row.
+_SQL_Q1_TOP_MOVIE = """
+    SELECT movieId, title
+    FROM movies
+    ORDER BY popularity DESC
+    LIMIT 1;
+"""
+
+_SQL_Q1_TOP_ACTORS = """
+    SELECT p.name AS actor_name,
+           p.popularity AS actor_popularity
+    FROM movie_credits mc
+    JOIN persons p ON p.id = mc.person_id
+    WHERE mc.movie_id = %s
+      AND mc.type = 'cast'
+    ORDER BY p.popularity DESC
+    LIMIT 10;
+"""
+
+
+@ttl_cache(RESULT_TTL_SECONDS)
 def query_1_most_popular_movie_with_top_actors():
     """
     1) Find the most popular movie.
     2) Return up to 10 most popular actors in that movie, along with actor details.
 
-    Returns a list of dictionaries with keys:
+    Returns a list of MovieActor rows with fields:
       - movie_title
       - actor_name
       - actor_popularity
     """
-    conn = get_db_connection()
-    if not conn:
-        return []
-
-    cursor = conn.cursor(dictionary=True)
     try:
-        sql = """
-            SELECT m.title AS movie_title,
-                   p.name AS actor_name,
-                   p.popularity AS actor_popularity
-            FROM movies m
-            JOIN movie_credits mc ON m.id = mc.movie_id
-            JOIN persons p ON mc.person_id = p.id
-            WHERE mc.type = 'cast'
-              AND m.id = (
-                  SELECT id
-                  FROM movies
-                  ORDER BY popularity DESC
-                  LIMIT 1
-              )
-            ORDER BY p.popularity DESC
-            LIMIT 10;
-        """
-        cursor.execute(sql)
-        results = cursor.fetchall()
-        return results
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_Q1_TOP_MOVIE)
+            top_movie = cursor.fetchone()
+            if top_movie is None:
+                return []
+            movie_id, movie_title = top_movie
+
+            # The title is shared by the returned rows
+            cursor.execute(_SQL_Q1_TOP_ACTORS, (movie_id,))
+            results = [MovieActor(movie_title, actor_name, actor_popularity)
+                       for actor_name, actor_popularity in cursor.fetchall()]
+            return results
 
     except Error as e:
         print(f"Error in query_1: {e}")
         return []
-    finally:
-        cursor.close()
-        conn.close()
 
 # ------------------------------------------------------------------------------
 # QUERY #2 (Complex):
@@ -88,7 +255,17 @@ def query_1_most_popular_movie_with_top_actors():
 #  Output columns: genre_name, movie_count, most_popular_movie
 # ------------------------------------------------------------------------------
 
+# Reads the summary table rebuilt at the end of seeding
+# (refresh_genre_top_movie in queries_db_script.py) instead of aggregating
+# movie_genres x movies on every call.
+_SQL_Q2 = """
+    SELECT genre_name, movie_count, most_popular_movie
+    FROM mv_genre_top_movie
+    ORDER BY movie_count DESC;
+"""
+
 
+@ttl_cache(RESULT_TTL_SECONDS)
 def query_2_genre_movie_counts_and_top_movie():
     """
     Returns, for each genre:
@@ -96,97 +273,90 @@ def query_2_genre_movie_counts_and_top_movie():
       2) Number of movies of that genre
       3) The title of the most popular movie in that genre
 
-    Example columns in the returned dictionaries:
+    Returns a list of GenreSummary rows with fields:
       - genre_name
       - movie_count
       - most_popular_movie
     """
-    conn = get_db_connection()
-    if not conn:
-        return []
-
-    cursor = conn.cursor(dictionary=True)
     try:
-        sql = """
-            SELECT g.name AS genre_name,
-                   COUNT(m.id) AS movie_count,
-                   (
-                     SELECT m2.title
-                     FROM movie_genres mg2
-                     JOIN movies m2 ON m2.id = mg2.movie_id
-                     WHERE mg2.genre_id = g.id
-                     ORDER BY m2.popularity DESC
-                     LIMIT 1
-                   ) AS most_popular_movie
-            FROM genres g
-            JOIN movie_genres mg ON mg.genre_id = g.id
-            JOIN movies m ON m.id = mg.movie_id
-            GROUP BY g.id
-            ORDER BY movie_count DESC;
-        """
-        cursor.execute(sql)
-        results = cursor.fetchall()
-        return results
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_Q2)
+            results = list(map(GenreSummary._make, cursor.fetchall()))
+            return results
 
     except Error as e:
         print(f"Error in query_2: {e}")
         return []
-    finally:
-        cursor.close()
-        conn.close()
 
 # ------------------------------------------------------------------------------
 # QUERY #3 (Full-Text):
 #  Search movie titles for a given substring (e.g., "באטמן") using FULLTEXT.
-#  Return matching movies, sorted by popularity (descending).
+#  Return matching movies, sorted by relevance for plain words, or by
+#  popularity (descending) when the input used Boolean-mode operators.
 #  Limit to top 10 for demonstration.
 #
-#  Make sure you have a FULLTEXT index on movies.title!
+#  Relies on the FULLTEXT index on movies.title (ft_title, created by
+#  create_db_script.py).
 #
 #  Output columns: id, title, popularity
 # ------------------------------------------------------------------------------
 
+# Boolean mode: words are prefix-matched to catch partial matches,
+# e.g. "+באטמן" -> "+באטמן*"; see _build_search_term
+_SQL_Q3_BOOLEAN = """
+    SELECT id, title, popularity
+    FROM movies
+    WHERE MATCH(title) AGAINST (%s IN BOOLEAN MODE)
+    ORDER BY popularity DESC
+    LIMIT 10;
+"""
+
+# Natural language mode ranks by relevance, so the full-text index drives
+# the ordering and popularity only breaks ties
+_SQL_Q3_NATURAL = """
+    SELECT id, title, popularity
+    FROM movies
+    WHERE MATCH(title) AGAINST (%s IN NATURAL LANGUAGE MODE)
+    ORDER BY MATCH(title) AGAINST (%s IN NATURAL LANGUAGE MODE) DESC,
+             popularity DESC
+    LIMIT 10;
+"""
+
 
 def query_3_fulltext_search_in_title(substring):
     """
     Full-text search in the 'movies.title' column.
-    For best substring matching, we can use a Boolean mode with an asterisk:
-      e.g. substring + '*'
-    Then order by popularity desc, limit 10.
-
-    Returns a list of dicts with:
+    The input is split into word tokens. Plain words (including hyphenated
+    ones such as "Spider-Man") are matched in natural language mode and
+    ordered by relevance, then popularity. If the input uses Boolean-mode
+    syntax (a leading + or -, quotes or *), it is searched in Boolean mode
+    instead, ordered by popularity: -terms are excluded, other words are
+    required prefix terms and quoted phrases are matched exactly, e.g.
+    'batman -lego' -> '+batman* -lego*'. Input with no word tokens (or
+    only excluded ones) returns [] without querying.
+    Limit 10.
+
+    Returns a list of MovieMatch rows with fields:
       - id
       - title
       - popularity
     """
-    conn = get_db_connection()
-    if not conn:
+    boolean_mode, search_term = _build_search_term(substring)
+    if not search_term:
         return []
 
-    cursor = conn.cursor(dictionary=True)
     try:
-        # We'll use Boolean mode for a more flexible match.
-        # If you want an exact token match, use NATURAL LANGUAGE MODE instead.
-        sql = """
-            SELECT id, title, popularity
-            FROM movies
-            WHERE MATCH(title) AGAINST (%s IN BOOLEAN MODE)
-            ORDER BY popularity DESC
-            LIMIT 10;
-        """
-        # Example: if substring = "באטמן", pass "באטמן*" to catch partial matches
-        search_term = substring.strip() + "*"
-
-        cursor.execute(sql, (search_term,))
-        results = cursor.fetchall()
-        return results
+        with _pooled_cursor() as cursor:
+            if boolean_mode:
+                cursor.execute(_SQL_Q3_BOOLEAN, (search_term,))
+            else:
+                cursor.execute(_SQL_Q3_NATURAL, (search_term, search_term))
+            results = list(map(MovieMatch._make, cursor.fetchall()))
+            return results
 
     except Error as e:
         print(f"Error in query_3: {e}")
         return []
-    finally:
-        cursor.close()
-        conn.close()
 
 # ------------------------------------------------------------------------------
 # QUERY #4 (Complex):
@@ -200,125 +370,168 @@ def query_3_fulltext_search_in_title(substring):
 #
 #  We'll implement this with a CASE expression on (mc.type, mc.job, p.gender).
 #  The final grouping will show how many individuals fall under each category.
+#  The 'Other (...)' buckets make the number of categories open-ended, so
+#  query_4_group_roles_by_gender() is paged (ROLE_CATEGORY_LIMIT rows by
+#  default); the reports use query_4_all_role_categories(), which returns
+#  every category from a single unpaged statement.
 # ------------------------------------------------------------------------------
 
-
-def query_4_group_roles_by_gender():
+# Adjust gender=1,2 mapping if your DB differs (1=female, 2=male is typical from TMDb).
+# We'll categorize only a few roles explicitly; everything else falls into 'Other ...'
+_ROLE_CATEGORY_EXPR = """
+    CASE
+      WHEN mc.type = 'cast' AND p.gender = 2 THEN 'שחקנים גברים'
+      WHEN mc.type = 'cast' AND p.gender = 1 THEN 'שחקניות נשים'
+      WHEN mc.type = 'crew' AND p.gender = 2 AND mc.job = 'Director' THEN 'במאים גברים'
+      WHEN mc.type = 'crew' AND p.gender = 1 AND mc.job = 'Director' THEN 'במאיות נשים'
+      ELSE CONCAT('Other (', IFNULL(mc.job,'No Job'), ' / Gender=', IFNULL(p.gender,'N/A'), ' / Type=', mc.type, ')')
+    END
+"""
+
+_SQL_Q4_ALL = f"""
+    SELECT {_ROLE_CATEGORY_EXPR} AS category,
+        COUNT(*) AS total
+    FROM movie_credits mc
+    JOIN persons p ON p.id = mc.person_id
+    GROUP BY category
+    ORDER BY total DESC, category
+"""
+
+_SQL_Q4 = _SQL_Q4_ALL + "    LIMIT %s OFFSET %s;\n"
+
+# Categories returned per call of query_4_group_roles_by_gender by default
+ROLE_CATEGORY_LIMIT = 100
+
+
+@ttl_cache(RESULT_TTL_SECONDS)
+def query_4_group_roles_by_gender(limit=ROLE_CATEGORY_LIMIT, offset=0):
     """
     Returns aggregated counts of persons by role (cast vs crew),
     gender, and specific job (e.g., Director).
     The CASE expression translates them into Hebrew category names.
+    Categories are ordered by total (descending) and paged: only `limit`
+    of them, starting at `offset`, are returned; use
+    query_4_all_role_categories() to get all of them at once.
 
-    Example returned columns:
+    Returns a list of RoleCount rows with fields:
       - category (str)
       - total (int)
     """
-    conn = get_db_connection()
-    if not conn:
+    try:
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_Q4, (limit, offset))
+            results = list(map(RoleCount._make, cursor.fetchall()))
+            return results
+
+    except Error as e:
+        print(f"Error in query_4: {e}")
         return []
 
-    cursor = conn.cursor(dictionary=True)
+
+@ttl_cache(RESULT_TTL_SECONDS)
+def query_4_all_role_categories():
+    """
+    Returns every category of query_4_group_roles_by_gender, in the same
+    order, from one unpaged GROUP BY. Used by the reports.
+
+    Returns a list of RoleCount rows with fields:
+      - category (str)
+      - total (int)
+    """
     try:
-        # Adjust gender=1,2 mapping if your DB differs (1=female, 2=male is typical from TMDb).
-        # We'll categorize only a few roles explicitly; everything else falls into 'Other ...'
-        sql = """
-            SELECT 
-                CASE 
-                  WHEN mc.type = 'cast' AND p.gender = 2 THEN 'שחקנים גברים'
-                  WHEN mc.type = 'cast' AND p.gender = 1 THEN 'שחקניות נשים'
-                  WHEN mc.type = 'crew' AND p.gender = 2 AND mc.job = 'Director' THEN 'במאים גברים'
-                  WHEN mc.type = 'crew' AND p.gender = 1 AND mc.job = 'Director' THEN 'במאיות נשים'
-                  ELSE CONCAT('Other (', IFNULL(mc.job,'No Job'), ' / Gender=', IFNULL(p.gender,'N/A'), ' / Type=', mc.type, ')')
-                END AS category,
-                COUNT(*) AS total
-            FROM movie_credits mc
-            JOIN persons p ON p.id = mc.person_id
-            GROUP BY category
-            ORDER BY total DESC;
-        """
-        cursor.execute(sql)
-        results = cursor.fetchall()
-        return results
+        with _pooled_cursor() as cursor:
+            cursor.execute(_SQL_Q4_ALL)
+            results = list(map(RoleCount._make, cursor.fetchall()))
+            return results
 
     except Error as e:
         print(f"Error in query_4: {e}")
         return []
-    finally:
-        cursor.close()
-        conn.close()
 
 # ------------------------------------------------------------------------------
 # MAIN DEMO
 # ------------------------------------------------------------------------------
 
 
+def run_all_queries():
+    """
+    Runs the four demo queries concurrently, each on its own pooled
+    connection, so the total wait is that of the slowest query rather than
+    the sum of all four.
+
+    Returns a tuple (q1_results, q2_results, q3_results, q4_results).
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = (
+            executor.submit(query_1_most_popular_movie_with_top_actors),
+            executor.submit(query_2_genre_movie_counts_and_top_movie),
+            executor.submit(query_3_fulltext_search_in_title, "באטמן"),
+            executor.submit(query_4_all_role_categories),
+        )
+        return tuple(future.result() for future in futures)
+
+
 def main():
     """
-    Demonstrates calling each query in sequence and printing the results.
+    Demonstrates calling each query and printing the results.
     Adjust or remove as needed for your assignment submission.
     """
+    q1_results, q2_results, q3_results, q4_results = run_all_queries()
+
     print("\n--- Query #1: Most popular movie & top 10 actors ---")
-    q1_results = query_1_most_popular_movie_with_top_actors()
     for row in q1_results:
-        print(f"Movie: {row['movie_title']}, Actor: {
-              row['actor_name']}, Actor Popularity: {row['actor_popularity']}")
+        print(f"Movie: {row.movie_title}, Actor: {
+              row.actor_name}, Actor Popularity: {row.actor_popularity}")
 
     print("\n--- Query #2: Genre counts & top movie in each genre ---")
-    q2_results = query_2_genre_movie_counts_and_top_movie()
     for row in q2_results:
-        print(f"Genre: {row['genre_name']}, Total Movies: {
-              row['movie_count']}, Most Popular: {row['most_popular_movie']}")
+        print(f"Genre: {row.genre_name}, Total Movies: {
+              row.movie_count}, Most Popular: {row.most_popular_movie}")
 
     print("\n--- Query #3: Full-text search in movie title (example: 'באטמן') ---")
-    q3_results = query_3_fulltext_search_in_title("באטמן")
     for row in q3_results:
-        print(f"Movie ID: {row['id']}, Title: {
-              row['title']}, Popularity: {row['popularity']}")
+        print(f"Movie ID: {row.id}, Title: {
+              row.title}, Popularity: {row.popularity}")
 
     print("\n--- Query #4: Group persons by role & gender ---")
-    q4_results = query_4_group_roles_by_gender()
     for row in q4_results:
-        print(f"{row['category']}: {row['total']}")
+        print(f"{row.category}: {row.total}")
 
 
 def main_to_file():
     """
-    Demonstrates calling each query in sequence and printing the results
-    to 'results.txt'.
+    Demonstrates calling each query and writing the results to
+    'results.txt'. The report is assembled in memory and written with a
+    single write() call.
     """
-    # Open 'results.txt' in write mode
+    q1_results, q2_results, q3_results, q4_results = run_all_queries()
+
+    lines = ["\n--- Query #1: Most popular movie & top 10 actors ---\n"]
+    lines.extend(f"Movie: {row.movie_title}, "
+                 f"Actor: {row.actor_name}, "
+                 f"Actor Popularity: {row.actor_popularity}\n"
+                 for row in q1_results)
+
+    lines.append("\n--- Query #2: Genre counts & top movie in each genre ---\n")
+    lines.extend(f"Genre: {row.genre_name}, "
+                 f"Total Movies: {row.movie_count}, "
+                 f"Most Popular: {row.most_popular_movie}\n"
+                 for row in q2_results)
+
+    lines.append(
+        "\n--- Query #3: Full-text search in movie title (example: 'באטמן') ---\n")
+    lines.extend(f"Movie ID: {row.id}, "
+                 f"Title: {row.title}, "
+                 f"Popularity: {row.popularity}\n"
+                 for row in q3_results)
+
+    lines.append("\n--- Query #4: Group persons by role & gender ---\n")
+    lines.extend(f"{row.category}: {row.total}\n"
+                 for row in q4_results)
+
     with open("results.txt", "w", encoding="utf-8") as f:
-        # Temporarily redirect stdout to the file
-        with redirect_stdout(f):
-
-            print("\n--- Query #1: Most popular movie & top 10 actors ---")
-            q1_results = query_1_most_popular_movie_with_top_actors()
-            for row in q1_results:
-                print(f"Movie: {row['movie_title']}, "
-                      f"Actor: {row['actor_name']}, "
-                      f"Actor Popularity: {row['actor_popularity']}")
-
-            print("\n--- Query #2: Genre counts & top movie in each genre ---")
-            q2_results = query_2_genre_movie_counts_and_top_movie()
-            for row in q2_results:
-                print(f"Genre: {row['genre_name']}, "
-                      f"Total Movies: {row['movie_count']}, "
-                      f"Most Popular: {row['most_popular_movie']}")
-
-            print(
-                "\n--- Query #3: Full-text search in movie title (example: 'באטמן') ---")
-            q3_results = query_3_fulltext_search_in_title("באטמן")
-            for row in q3_results:
-                print(f"Movie ID: {row['id']}, "
-                      f"Title: {row['title']}, "
-                      f"Popularity: {row['popularity']}")
-
-            print("\n--- Query #4: Group persons by role & gender ---")
-            q4_results = query_4_group_roles_by_gender()
-            for row in q4_results:
-                print(f"{row['category']}: {row['total']}")
-
-    # After the `with redirect_stdout(f)` block, all prints revert to normal console output.
+        f.write("".join(lines))
+
     print("Results successfully written to results.txt")
 
 